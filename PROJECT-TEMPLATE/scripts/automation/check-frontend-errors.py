@@ -3,72 +3,91 @@
 Frontend Error Checker - Automatically detect console errors
 ==============================================================
 Loads the frontend and captures ALL console errors, warnings, and network failures
-Usage: python3 check-frontend-errors.py <url>
-Last updated: 2025-12-11
+Usage: python3 check-frontend-errors.py <url> [--record-har PATH | --replay-har PATH [--latency MS]]
+Last updated: 2026-10-19
 """
 
+import argparse
 import asyncio
 import sys
 import json
 from playwright.async_api import async_playwright
+from har_replay import add_har_arguments, validate_har_arguments, new_context, HarArchiveError
+
+async def load_page(context, url, har_args, console_messages, page_errors, failed_requests):
+    """Load the page, capturing console messages, page errors and failed responses"""
+    page = await context.new_page()
+
+    # Capture ALL console messages
+    def handle_console(msg):
+        console_messages.append({
+            "type": msg.type,
+            "text": msg.text,
+            "location": msg.location
+        })
+
+    page.on("console", handle_console)
+
+    # Capture page errors (JavaScript errors)
+    def handle_page_error(error):
+        page_errors.append(str(error))
+
+    page.on("pageerror", handle_page_error)
+
+    # Capture network failures
+    def handle_response(response):
+        if not response.ok:
+            failed_requests.append({
+                "url": response.url,
+                "status": response.status,
+                "method": response.request.method
+            })
+
+    page.on("response", handle_response)
+
+    # Load page
+    print(f"\n🌐 Loading {url}...")
+    try:
+        await page.goto(url, wait_until="networkidle", timeout=30000)
+        print(f"✅ Page loaded")
+    except Exception as e:
+        print(f"❌ Failed to load page: {e}")
+        return False
+
+    # Wait for any async errors (replayed traffic is already settled by networkidle)
+    if not har_args.replay_har:
+        await asyncio.sleep(5)
 
-async def check_frontend_errors(url):
+    # Take screenshot for reference
+    await page.screenshot(path="/tmp/frontend-error-check.png", full_page=True)
+    return True
+
+async def check_frontend_errors(url, har_args):
     """Check frontend for errors without user having to copy/paste"""
 
     console_messages = []
     page_errors = []
     network_errors = []
     failed_requests = []
+    not_in_archive = []
 
     async with async_playwright() as p:
         browser = await p.chromium.launch(headless=True)
-        context = await browser.new_context()
-        page = await context.new_page()
-
-        # Capture ALL console messages
-        def handle_console(msg):
-            console_messages.append({
-                "type": msg.type,
-                "text": msg.text,
-                "location": msg.location
-            })
-
-        page.on("console", handle_console)
-
-        # Capture page errors (JavaScript errors)
-        def handle_page_error(error):
-            page_errors.append(str(error))
-
-        page.on("pageerror", handle_page_error)
-
-        # Capture network failures
-        def handle_response(response):
-            if not response.ok:
-                failed_requests.append({
-                    "url": response.url,
-                    "status": response.status,
-                    "method": response.request.method
-                })
-
-        page.on("response", handle_response)
-
-        # Load page
-        print(f"\n🌐 Loading {url}...")
         try:
-            await page.goto(url, wait_until="networkidle", timeout=30000)
-            print(f"✅ Page loaded")
-        except Exception as e:
-            print(f"❌ Failed to load page: {e}")
+            context = await new_context(browser, har_args, not_in_archive=not_in_archive)
+        except HarArchiveError as e:
+            print(f"❌ {e}")
             await browser.close()
             return False
 
-        # Wait for any async errors
-        await asyncio.sleep(5)
-
-        # Take screenshot for reference
-        await page.screenshot(path="/tmp/frontend-error-check.png", full_page=True)
-
-        await browser.close()
+        try:
+            if not await load_page(context, url, har_args, console_messages,
+                                   page_errors, failed_requests):
+                return False
+        finally:
+            # Closing the context is what writes a recorded HAR archive
+            await context.close()
+            await browser.close()
 
         # Analyze and display errors
         print("\n" + "="*80)
@@ -111,6 +130,12 @@ async def check_frontend_errors(url):
         else:
             print("\n✅ No failed requests")
 
+        # Replay misses are expected for URLs that change between runs
+        if not_in_archive:
+            print(f"\n⚠️  NOT IN ARCHIVE ({len(not_in_archive)}) - aborted during replay, not counted as failures:")
+            for i, req in enumerate(not_in_archive[:5], 1):  # Show first 5
+                print(f"\n  [{i}] {req['method']} {req['url']}")
+
         # Summary
         print("\n" + "="*80)
         print("SUMMARY")
@@ -120,6 +145,8 @@ async def check_frontend_errors(url):
         print(f"Console warnings: {len(warnings)}")
         print(f"Page errors: {len(page_errors)}")
         print(f"Failed requests: {len(failed_requests)}")
+        if har_args.replay_har:
+            print(f"Not in archive: {len(not_in_archive)}")
         print(f"\n📸 Screenshot saved to /tmp/frontend-error-check.png")
         print("="*80)
 
@@ -128,11 +155,14 @@ async def check_frontend_errors(url):
         return not has_errors
 
 if __name__ == "__main__":
-    if len(sys.argv) < 2:
-        print("Usage: python3 check-frontend-errors.py <url>")
-        print("Example: python3 check-frontend-errors.py https://www.tradeflyai.com")
-        sys.exit(1)
-
-    url = sys.argv[1]
-    success = asyncio.run(check_frontend_errors(url))
+    parser = argparse.ArgumentParser(
+        description="Detect console errors, page errors and failed requests",
+        epilog="Example: python3 check-frontend-errors.py https://www.tradeflyai.com"
+    )
+    parser.add_argument("url", help="URL to check")
+    add_har_arguments(parser)
+    args = parser.parse_args()
+    validate_har_arguments(parser, args)
+
+    success = asyncio.run(check_frontend_errors(args.url, args))
     sys.exit(0 if success else 1)
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+HAR Record & Replay - Deterministic, offline re-verification
+=============================================================
+Shared by check-frontend-errors.py and triple-verify.py.
+
+  --record-har PATH   Save every network response the page makes to a HAR archive
+  --replay-har PATH   Serve responses from a HAR archive instead of the network
+                      (requests missing from the archive are aborted, never sent,
+                      and reported separately as "not in archive" warnings)
+  --latency MS        In replay mode, delay every response by MS milliseconds
+                      to simulate a slow network
+
+Record once against the live site, then re-verify frontend changes offline:
+  python3 triple-verify.py https://www.yourapp.com --record-har /tmp/yourapp.har
+  python3 triple-verify.py https://www.yourapp.com --replay-har /tmp/yourapp.har
+Last updated: 2026-10-19
+"""
+
+import asyncio
+import os
+
+
+class HarArchiveError(Exception):
+    """Raised when a --replay-har archive cannot be loaded"""
+
+
+def add_har_arguments(parser):
+    """Add --record-har / --replay-har / --latency to an argparse parser"""
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument("--record-har", metavar="PATH",
+                       help="record network traffic to a HAR archive")
+    group.add_argument("--replay-har", metavar="PATH",
+                       help="replay network traffic from a HAR archive (offline)")
+    parser.add_argument("--latency", type=int, default=0, metavar="MS",
+                        help="inject MS milliseconds of latency per response in replay mode")
+
+
+def validate_har_arguments(parser, args):
+    """Reject argument combinations that cannot work before launching a browser"""
+    if args.latency < 0:
+        parser.error("--latency must be >= 0")
+    if args.latency and not args.replay_har:
+        parser.error("--latency only applies with --replay-har")
+    if args.replay_har and not os.path.isfile(args.replay_har):
+        parser.error(f"HAR archive not found: {args.replay_har}")
+
+
+async def new_context(browser, args, not_in_archive=None, **context_options):
+    """
+    Create a browser context in live, record or replay mode.
+
+    In replay mode, requests missing from the archive (cache-busting query
+    strings, beacons with random IDs, ...) are aborted and appended to the
+    not_in_archive list as {"url", "method"} so callers can report them as
+    warnings instead of network failures. Raises HarArchiveError if the
+    archive cannot be loaded.
+
+    The caller must close the returned context (not just the browser)
+    so a recorded HAR archive is flushed to disk.
+    """
+    if args.record_har or args.replay_har:
+        # Requests handled by a service worker bypass routing and recording,
+        # so block service workers to keep the archive complete and replay offline
+        context_options.setdefault("service_workers", "block")
+
+    if args.record_har:
+        context = await browser.new_context(
+            record_har_path=args.record_har,
+            record_har_content="embed",
+            **context_options
+        )
+        print(f"🎙️  Recording network traffic to {args.record_har}")
+        return context
+
+    context = await browser.new_context(**context_options)
+
+    if args.replay_har:
+        # Routes registered later run first: the HAR handler falls back to this
+        # one for unmatched requests, which are aborted so replay never touches
+        # the network, and recorded so they are not mistaken for real failures
+        async def abort_not_in_archive(route):
+            if not_in_archive is not None:
+                not_in_archive.append({
+                    "url": route.request.url,
+                    "method": route.request.method
+                })
+            await route.abort()
+
+        await context.route("**/*", abort_not_in_archive)
+
+        try:
+            await context.route_from_har(args.replay_har, not_found="fallback")
+        except Exception as e:
+            await context.close()
+            raise HarArchiveError(f"Failed to load HAR archive {args.replay_har}: {e}") from e
+        print(f"📼 Replaying network traffic from {args.replay_har}")
+
+        if args.latency:
+            delay = args.latency / 1000
+
+            # Routes registered later run first, so this delays every request
+            # before falling through to the HAR handlers above
+            async def inject_latency(route):
+                await asyncio.sleep(delay)
+                await route.fallback()
+
+            await context.route("**/*", inject_latency)
+            print(f"🐢 Injecting {args.latency}ms latency per response")
+
+    return context
@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+API Load Probe - Catch backend latency regressions under load
+==============================================================
+Replays idempotent GET endpoints at a fixed concurrency for a fixed duration
+and reports throughput, error rate and latency percentiles per endpoint.
+
+Used by test-deployment.py (--load-probe) on the /api/ calls the page makes,
+or directly against any URLs (e.g. a local stub server):
+  python3 load_probe.py http://localhost:8000/api/health --concurrency 20 --duration 10
+Last updated: 2026-10-19
+"""
+
+import argparse
+import asyncio
+import math
+import sys
+import time
+from urllib.parse import urlparse
+from playwright.async_api import async_playwright
+
+# Upper bounds (ms) of the latency histogram buckets
+HISTOGRAM_BUCKETS = [50, 100, 250, 500, 1000, 2500, math.inf]
+
+# Captured request headers that must not be replayed verbatim
+# (cookies come from the shared cookie jar, the rest is per-connection)
+SKIPPED_HEADERS = {"cookie", "host", "content-length"}
+
+
+def add_load_probe_arguments(parser):
+    """Add load-probe tuning and threshold options to an argparse parser"""
+    parser.add_argument("--concurrency", type=int, default=10, metavar="N",
+                        help="concurrent in-flight requests (default: 10)")
+    parser.add_argument("--duration", type=float, default=10, metavar="SECONDS",
+                        help="how long to sustain load (default: 10)")
+    parser.add_argument("--timeout", type=float, default=10, metavar="SECONDS",
+                        help="per-request timeout (default: 10)")
+    parser.add_argument("--max-p95", type=float, default=1000, metavar="MS",
+                        help="fail an endpoint whose p95 latency exceeds MS (default: 1000)")
+    parser.add_argument("--max-error-rate", type=float, default=0.01, metavar="RATIO",
+                        help="fail an endpoint whose error rate exceeds RATIO (default: 0.01)")
+
+
+def validate_load_probe_arguments(parser, args):
+    """Reject settings that would make the probe meaningless"""
+    if args.concurrency < 1:
+        parser.error("--concurrency must be >= 1")
+    if args.duration <= 0:
+        parser.error("--duration must be > 0")
+    if args.timeout <= 0:
+        parser.error("--timeout must be > 0")
+    if args.max_p95 <= 0:
+        parser.error("--max-p95 must be > 0")
+    if not 0 <= args.max_error_rate <= 1:
+        parser.error("--max-error-rate must be between 0 and 1")
+
+
+def select_endpoints(network_requests, origin_urls, any_host=False):
+    """
+    Pick the unique idempotent (GET) /api/ URLs from captured network requests.
+
+    Returns {url: headers}, where headers are the ones the page sent (minus
+    SKIPPED_HEADERS) so header-authenticated endpoints stay authenticated.
+    Only endpoints on the same host as one of origin_urls are kept, so third-party
+    APIs the page calls (analytics, CDNs, vendors) are never put under load
+    unless any_host is set.
+    """
+    hosts = {urlparse(origin).netloc for origin in origin_urls}
+    endpoints = {}
+    for req in network_requests:
+        if req['method'] != 'GET' or '/api/' not in req['url'] or req['url'] in endpoints:
+            continue
+        if any_host or urlparse(req['url']).netloc in hosts:
+            endpoints[req['url']] = {
+                name: value for name, value in req.get('headers', {}).items()
+                if name.lower() not in SKIPPED_HEADERS and not name.startswith(':')
+            }
+    return endpoints
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list (None if empty)"""
+    if not sorted_values:
+        return None
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def summarize(url, latencies, errors, elapsed, args):
+    """Build the per-endpoint report, including pass/fail against thresholds"""
+    latencies = sorted(latencies)
+    total = len(latencies) + errors
+    error_rate = errors / total if total else 0.0
+
+    histogram = []
+    lower = 0
+    for upper in HISTOGRAM_BUCKETS:
+        histogram.append((upper, sum(1 for ms in latencies if lower <= ms < upper)))
+        lower = upper
+
+    stats = {
+        "url": url,
+        "requests": total,
+        "errors": errors,
+        "error_rate": error_rate,
+        "throughput": total / elapsed if elapsed else 0.0,
+        "p50": percentile(latencies, 50),
+        "p95": percentile(latencies, 95),
+        "p99": percentile(latencies, 99),
+        "histogram": histogram
+    }
+
+    # Record why an endpoint failed so the report can say so
+    failures = []
+    if total == 0:
+        failures.append("no requests completed")
+    else:
+        if error_rate > args.max_error_rate:
+            failures.append(f"error rate {error_rate:.1%} > {args.max_error_rate:.1%}")
+        if stats["p95"] is None:
+            failures.append("no successful requests")
+        elif stats["p95"] > args.max_p95:
+            failures.append(f"p95 {stats['p95']:.0f}ms > {args.max_p95:.0f}ms")
+    stats["failures"] = failures
+    stats["passed"] = not failures
+    return stats
+
+
+async def probe_endpoints(request, endpoints, args):
+    """
+    Hammer the endpoints ({url: headers}) round-robin with args.concurrency
+    workers for args.duration seconds, using the given APIRequestContext (pass
+    a browser context's `context.request` to share its cookies). Successful latencies and
+    error counts are tracked per endpoint; redirects are followed, and a final
+    non-2xx status or a transport failure counts as an error.
+    """
+    urls = list(endpoints)
+    latencies = {url: [] for url in urls}
+    errors = {url: 0 for url in urls}
+    next_index = 0
+
+    async def worker(deadline):
+        nonlocal next_index
+        while time.monotonic() < deadline:
+            url = urls[next_index % len(urls)]
+            next_index += 1
+            start = time.perf_counter()
+            try:
+                response = await request.get(url, headers=endpoints[url],
+                                             timeout=args.timeout * 1000)
+                elapsed_ms = (time.perf_counter() - start) * 1000
+                await response.dispose()
+                if response.ok:
+                    latencies[url].append(elapsed_ms)
+                else:
+                    errors[url] += 1
+            except Exception:
+                errors[url] += 1
+
+    started = time.monotonic()
+    deadline = started + args.duration
+    await asyncio.gather(*(worker(deadline) for _ in range(args.concurrency)))
+    elapsed = time.monotonic() - started
+
+    return [summarize(url, latencies[url], errors[url], elapsed, args) for url in urls]
+
+
+def print_report(results, args):
+    """Print the per-endpoint load report and return True if every endpoint passed"""
+    print("\n" + "="*60)
+    print("API LOAD PROBE")
+    print("="*60)
+    print(f"Concurrency: {args.concurrency} | Duration: {args.duration}s")
+    print(f"Thresholds: p95 <= {args.max_p95:.0f}ms, error rate <= {args.max_error_rate:.1%}")
+
+    for stats in results:
+        status_emoji = "✅" if stats['passed'] else "❌"
+        print(f"\n{status_emoji} {stats['url']}")
+        if stats['failures']:
+            print(f"  Failed: {', '.join(stats['failures'])}")
+        if not stats['requests']:
+            continue
+        print(f"  Requests: {stats['requests']} ({stats['throughput']:.1f} req/s)")
+        print(f"  Errors: {stats['errors']} ({stats['error_rate']:.1%})")
+        if stats['p50'] is None:
+            print("  Latency: n/a (no successful requests)")
+            continue
+        print(f"  Latency: p50 {stats['p50']:.0f}ms | p95 {stats['p95']:.0f}ms | p99 {stats['p99']:.0f}ms")
+
+        successes = stats['requests'] - stats['errors']
+        for upper, count in stats['histogram']:
+            label = f"< {upper}ms" if upper != math.inf else f">= {HISTOGRAM_BUCKETS[-2]}ms"
+            bar = "█" * round(count / successes * 30) if successes else ""
+            print(f"    {label:>10} | {bar} {count}")
+
+    passed = all(stats['passed'] for stats in results)
+    print("\n" + "="*60)
+    print(f"Endpoints probed: {len(results)}")
+    print(f"Endpoints failed: {sum(1 for stats in results if not stats['passed'])}")
+    print("="*60)
+    return passed
+
+
+async def run_load_probe(request, endpoints, args):
+    """Probe the endpoints ({url: headers}) and print the report; returns True if all passed"""
+    if not endpoints:
+        print("\nℹ️  No GET /api/ endpoints to load-probe")
+        return True
+
+    print(f"\n🚦 Load-probing {len(endpoints)} endpoint(s)...")
+    results = await probe_endpoints(request, endpoints, args)
+    return print_report(results, args)
+
+
+async def main(args):
+    async with async_playwright() as p:
+        if args.insecure:
+            print("⚠️  TLS certificate verification disabled (--insecure)")
+        request = await p.request.new_context(ignore_https_errors=args.insecure)
+        try:
+            return await run_load_probe(request, {url: {} for url in args.urls}, args)
+        finally:
+            await request.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Replay GET endpoints under concurrent load and check latency thresholds",
+        epilog="Example: python3 load_probe.py https://www.example.com/api/health --concurrency 20"
+    )
+    parser.add_argument("urls", nargs="+", metavar="url", help="GET endpoint(s) to probe")
+    parser.add_argument("--insecure", action="store_true",
+                        help="skip TLS certificate verification (e.g. self-signed local stubs)")
+    add_load_probe_arguments(parser)
+    args = parser.parse_args()
+    validate_load_probe_arguments(parser, args)
+
+    success = asyncio.run(main(args))
+    sys.exit(0 if success else 1)
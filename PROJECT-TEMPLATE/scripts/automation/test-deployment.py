@@ -3,15 +3,18 @@
 Playwright Deployment Test Script
 ==================================
 Tests deployed application with Playwright
-Usage: python3 test-deployment.py <url>
-Last updated: 2025-12-11
+Usage: python3 test-deployment.py <url> [--load-probe [--concurrency N] [--duration SECONDS]]
+Last updated: 2026-10-19
 """
 
+import argparse
 import asyncio
 import sys
 from playwright.async_api import async_playwright
+from load_probe import (add_load_probe_arguments, validate_load_probe_arguments,
+                        select_endpoints, run_load_probe)
 
-async def test_deployment(url):
+async def test_deployment(url, args):
     """Test deployment with comprehensive checks"""
 
     errors = []
@@ -35,7 +38,9 @@ async def test_deployment(url):
                 "url": response.url,
                 "status": response.status,
                 "ok": response.ok,
-                "method": response.request.method
+                "method": response.request.method,
+                # Sent headers (Authorization, apikey, ...) so --load-probe can replay them
+                "headers": await response.request.all_headers()
             })
 
         page.on("response", handle_response)
@@ -90,6 +95,13 @@ async def test_deployment(url):
         await page.screenshot(path=screenshot_path, full_page=True)
         print(f"\n📸 Screenshot saved to {screenshot_path}")
 
+        # Test 7: Load-probe discovered GET /api/ endpoints
+        # (context.request shares the page's cookies, so authenticated endpoints stay authenticated)
+        load_probe_passed = True
+        if args.load_probe:
+            endpoints = select_endpoints(api_calls, [url, current_url], args.probe_any_host)
+            load_probe_passed = await run_load_probe(context.request, endpoints, args)
+
         await browser.close()
 
         # Summary
@@ -98,6 +110,8 @@ async def test_deployment(url):
         print(f"Failed requests (404): {len(failed_requests)}")
         print(f"Console errors: {len(error_logs)}")
         print(f"Page errors: {len(errors)}")
+        if args.load_probe:
+            print(f"Load probe: {'passed' if load_probe_passed else 'FAILED'}")
         print("="*60)
 
         # Determine success
@@ -105,7 +119,8 @@ async def test_deployment(url):
             response.status == 200 and
             len(failed_requests) == 0 and
             len(error_logs) == 0 and
-            len(errors) == 0
+            len(errors) == 0 and
+            load_probe_passed
         )
 
         if success:
@@ -116,11 +131,18 @@ async def test_deployment(url):
         return success
 
 if __name__ == "__main__":
-    if len(sys.argv) < 2:
-        print("Usage: python3 test-deployment.py <url>")
-        print("Example: python3 test-deployment.py https://www.example.com")
-        sys.exit(1)
-
-    url = sys.argv[1]
-    success = asyncio.run(test_deployment(url))
+    parser = argparse.ArgumentParser(
+        description="Test a deployed application with Playwright",
+        epilog="Example: python3 test-deployment.py https://www.example.com --load-probe"
+    )
+    parser.add_argument("url", help="URL to test")
+    parser.add_argument("--load-probe", action="store_true",
+                        help="replay discovered GET /api/ endpoints under concurrent load")
+    parser.add_argument("--probe-any-host", action="store_true",
+                        help="also load-probe /api/ endpoints on third-party hosts (default: same host only)")
+    add_load_probe_arguments(parser)
+    args = parser.parse_args()
+    validate_load_probe_arguments(parser, args)
+
+    success = asyncio.run(test_deployment(args.url, args))
     sys.exit(0 if success else 1)